@@ -1,75 +1,26 @@
 import streamlit as st
-import requests
-from groq import Groq
-from fpdf import FPDF
-from supabase import create_client, Client
-import pandas as pd
-
-# --- 1. CONFIGURATION & SECRETS ---
-# Ensure these are set in your Streamlit Cloud Secrets or .env
-OCR_API_KEY = st.secrets.get("OCR_API_KEY", "helloworld")
-GROQ_API_KEY = st.secrets.get("GROQ_API_KEY", "")
-SUPABASE_URL = st.secrets.get("SUPABASE_URL", "")
-SUPABASE_KEY = st.secrets.get("SUPABASE_KEY", "")
-
-# Initialize Clients
-client = Groq(api_key=GROQ_API_KEY)
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-st.set_page_config(page_title="ClaimShield Pro", layout="wide", page_icon="🛡️")
+from config import OCR_API_KEY
+from llm_cache import LLMCache
+from claimshield.auth import login_user, logout_user, register_user
+from claimshield.clients import get_groq, get_llm_cache
+from claimshield.db import (load_claims, load_claims_leaderboard, load_claims_total,
+                            report_save_errors, save_claim)
+from claimshield.ocr import ocr_documents
+from claimshield.pdf import generate_pdf
+from claimshield.prompt import SYSTEM_PROMPT
 
-# --- 2. AUTHENTICATION LOGIC ---
-
-def login_user(email, password):
-    try:
-        res = supabase.auth.sign_in_with_password({"email": email, "password": password})
-        st.session_state['user'] = res.user
-        st.rerun()
-    except Exception as e:
-        st.error("Invalid email or password.")
-
-def register_user(email, password):
-    try:
-        res = supabase.auth.sign_up({"email": email, "password": password})
-        st.success("Registration successful! Please check your email or login.")
-    except Exception as e:
-        st.error(f"Registration failed: {e}")
-
-def logout_user():
-    supabase.auth.sign_out()
-    del st.session_state['user']
-    st.rerun()
-
-# --- 3. CORE APP FUNCTIONS ---
-
-def generate_pdf(text):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.cell(0, 10, "FORMAL MEDICAL APPEAL", ln=True, align="C")
-    pdf.ln(10)
-    pdf.set_font("Helvetica", size=11)
-    pdf.multi_cell(0, 8, text)
-    return pdf.output()
-
-def save_claim(company, amount, letter):
-    data = {
-        "user_id": st.session_state['user'].id,
-        "insurance_company": company,
-        "bill_amount": amount,
-        "appeal_letter": letter
-    }
-    supabase.table("claims").insert(data).execute()
+st.set_page_config(page_title="ClaimShield Pro", layout="wide", page_icon="🛡️")
 
-# --- 4. NAVIGATION & ROUTING ---
+# --- NAVIGATION & ROUTING ---
 
 if 'user' not in st.session_state:
     # --- LANDING PAGE / LOGIN ---
     st.title("🛡️ ClaimShield")
     st.subheader("The AI-Powered Machine for Fighting Medical Debt")
-    
+
     col1, col2 = st.columns([2, 1])
-    
+
     with col1:
         st.markdown("""
         ### Why ClaimShield?
@@ -83,14 +34,14 @@ if 'user' not in st.session_state:
         auth_mode = st.radio("Access Portal", ["Login", "Register"])
         email = st.text_input("Email Address")
         password = st.text_input("Password", type="password")
-        
+
         if auth_mode == "Login":
             if st.button("Unlock Dashboard", use_container_width=True):
                 login_user(email, password)
         else:
             if st.button("Create Free Account", use_container_width=True):
                 register_user(email, password)
-    
+
     st.info("💡 Tip: Use a strong password to protect your medical claim history.")
     st.stop() # Force app to stop here if not logged in
 
@@ -100,7 +51,7 @@ else:
         st.write(f"👤 **User:** {st.session_state['user'].email}")
         if st.button("Log Out"):
             logout_user()
-        
+
         st.divider()
         # Admin logic
         is_admin = st.session_state['user'].email == "complyra86@gmail.com" # Change to your email
@@ -108,59 +59,132 @@ else:
             st.warning("👑 ADMIN ACCESS ENABLED")
 
     st.title("🛡️ ClaimShield: One-Tap Appeal Platform")
-    
+    report_save_errors()  # background claim inserts from earlier reruns
+
     tab1, tab2 = st.tabs(["🚀 New Appeal", "📊 History & Analytics"])
 
     with tab1:
         c1, c2 = st.columns(2)
         with c1:
             st.header("1. Scan & Extract")
-            file = st.file_uploader("Upload Medical Bill (JPG/PNG)", type=["jpg", "png"])
-            if file and st.button("Analyze Document"):
+            files = st.file_uploader("Upload Medical Bill (JPG/PNG/PDF)",
+                                     type=["jpg", "png", "pdf"],
+                                     accept_multiple_files=True)
+            if files and st.button("Analyze Document"):
                 with st.spinner("AI is auditing for legal violations..."):
                     payload = {'apikey': OCR_API_KEY, 'OCREngine': 2}
-                    res = requests.post('https://api.ocr.space/parse/image', 
-                                        files={'file': file.getvalue()}, data=payload).json()
-                    
-                    if res.get('ParsedResults'):
-                        text = res['ParsedResults'][0]['ParsedText']
+                    # All pages end up in ONE user message behind the shared
+                    # system prompt, so Groq prefills the static prefix once
+                    # instead of once per page.
+                    text = ocr_documents([(f.name, f.getvalue()) for f in files], payload)
+
+                    if text:
                         st.session_state['last_text'] = text
-                        
-                        prompt = f"System: You are a legal advocate. User: Draft a No Surprises Act appeal for: {text}"
-                        chat = client.chat.completions.create(
-                            model="llama-3.1-70b-versatile",
-                            messages=[{"role": "user", "content": prompt}]
-                        )
-                        st.session_state['last_letter'] = chat.choices[0].message.content
+
+                        model = "llama-3.1-70b-versatile"
+                        messages = [
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": text}
+                        ]
+
+                        # Exact-hash then semantic cache lookup before paying
+                        # for a full LLM round-trip (repeat bills are common).
+                        cache = get_llm_cache()
+                        cache_key = LLMCache.exact_key(model, messages, 0)
+                        letter = cache.get(cache_key, text)
+                        if letter is None:
+                            # Stream so the letter renders at first-token
+                            # latency (~100-300ms) instead of blocking for the
+                            # full generation behind a spinner.
+                            stream = get_groq().chat.completions.create(
+                                model=model,
+                                messages=messages,
+                                temperature=0,
+                                seed=42,
+                                stream=True
+                            )
+
+                            def token_gen():
+                                acc = []
+                                try:
+                                    for chunk in stream:
+                                        t = chunk.choices[0].delta.content or ""
+                                        acc.append(t)
+
+                                        # Track Groq-side prefix-cache effectiveness so we
+                                        # notice if the system prompt stops being stable.
+                                        usage = getattr(getattr(chunk, 'x_groq', None), 'usage', None)
+                                        if usage is not None:
+                                            cached = getattr(usage, 'cached_tokens', 0) or 0
+                                            stats = st.session_state.setdefault('prompt_cache_stats', {'calls': 0, 'cached_tokens': 0})
+                                            stats['calls'] += 1
+                                            stats['cached_tokens'] += cached
+                                        yield t
+                                finally:
+                                    # Runs even if the user navigates away
+                                    # mid-stream, so partial letters survive.
+                                    st.session_state['last_letter'] = "".join(acc)
+
+                            st.write_stream(token_gen())
+                            letter = st.session_state['last_letter']
+                            cache.put(cache_key, text, letter)
+                        else:
+                            st.session_state['last_letter'] = letter
                         st.success("Analysis Ready!")
 
         with c2:
             st.header("2. Review & Save")
             if 'last_letter' in st.session_state:
                 letter = st.text_area("Final Appeal Letter", st.session_state['last_letter'], height=300)
-                
+
                 with st.form("save_case"):
                     ins = st.text_input("Insurance Provider")
                     val = st.number_input("Bill Value ($)", min_value=0.0)
                     if st.form_submit_button("📁 Save to My Case History"):
-                        save_claim(ins, val, letter)
+                        save_claim(st.session_state['user'].id, ins, val, letter)
                         st.balloons()
-                
+
                 st.download_button("📥 Download PDF", data=generate_pdf(letter), file_name="Appeal.pdf")
 
     with tab2:
         st.header("Your Claim History")
-        # Filter data by logged-in user ID
-        query = supabase.table("claims").select("*")
-        if not is_admin:
-            query = query.eq("user_id", st.session_state['user'].id)
-        
-        data = query.execute()
-        
-        if data.data:
-            df = pd.DataFrame(data.data)
-            st.dataframe(df[['created_at', 'insurance_company', 'bill_amount', 'status']], use_container_width=True)
-            st.metric("Total Disputed Amount", f"${df['bill_amount'].sum():,.2f}")
+        # Filter, project and aggregate server-side: select only the columns
+        # the table renders (the multi-KB appeal_letter stays in Postgres)
+        # and let the claims_total function compute the metric instead of
+        # shipping every row over the wire (migrations/0003).
+        uid = None if is_admin else st.session_state['user'].id
+        PAGE_SIZE = 50
+
+        # Keyset pagination on created_at: with the covering index from
+        # migrations/0004 each page is an index-only scan, so load time
+        # stays O(page) no matter how large the history gets.
+        if 'history_rows' not in st.session_state:
+            page = load_claims(uid, None, PAGE_SIZE)
+            st.session_state['history_rows'] = page
+            # A short page means we've seen the oldest claim; only a full
+            # page suggests more exist (len(rows) % PAGE_SIZE can't tell
+            # the two apart, and optimistic inserts skew it anyway).
+            st.session_state['history_has_more'] = len(page) == PAGE_SIZE
+        rows = st.session_state['history_rows']
+
+        if rows:
+            # st.dataframe renders the list of dicts directly; building a
+            # pandas DataFrame for ~50 rows was pure object-creation
+            # overhead (plus the 80MB import) for zero display difference.
+            st.dataframe(rows, use_container_width=True)
+            st.metric("Total Disputed Amount", f"${load_claims_total(uid):,.2f}")
+
+            leaderboard = load_claims_leaderboard(uid)
+            if leaderboard:
+                st.subheader("Claims by Insurer")
+                st.bar_chart({r['insurance_company']: r['n'] for r in leaderboard})
+
+            # Only offer more pages while the last fetch came back full.
+            if st.session_state.get('history_has_more') and st.button("Load older claims"):
+                page = load_claims(uid, rows[-1]['created_at'], PAGE_SIZE)
+                st.session_state['history_rows'] = rows + page
+                st.session_state['history_has_more'] = len(page) == PAGE_SIZE
+                st.rerun()
         else:
             st.info("No claims saved yet. Start by uploading a bill in the first tab!")
 
@@ -180,9 +204,9 @@ st.markdown(
     </style>
     <div class="complyra-footer">
         <p>© 2026 <b>Complyra</b>. All Rights Reserved.</p>
-        <p><i>ClaimShield is a proprietary technology of Complyra. Unauthorized duplication or 
+        <p><i>ClaimShield is a proprietary technology of Complyra. Unauthorized duplication or
         commercial use of this platform's AI logic and legal-audit workflows is strictly prohibited.</i></p>
-        <p><b>Legal Notice:</b> This application provides automated assistance based on the No Surprises Act. 
+        <p><b>Legal Notice:</b> This application provides automated assistance based on the No Surprises Act.
         It does not constitute legal representation. All generated appeals must be reviewed by the user.</p>
     </div>
     """,
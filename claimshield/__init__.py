@@ -0,0 +1,6 @@
+"""ClaimShield helper modules.
+
+Everything that isn't UI lives here so Streamlit's per-interaction rerun
+only re-executes the thin script in app.py — these modules are imported
+once and cached by Python's import system.
+"""
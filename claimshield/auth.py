@@ -0,0 +1,38 @@
+"""Supabase auth helpers for the login/logout flows."""
+
+import streamlit as st
+
+from claimshield.clients import new_supabase
+
+
+def _session_supabase():
+    # One client per Streamlit session: the auth session supabase-py
+    # attaches after sign-in stays inside this session's client instead of
+    # leaking into the process-wide cached one that every user shares.
+    if 'supabase_auth_client' not in st.session_state:
+        st.session_state['supabase_auth_client'] = new_supabase()
+    return st.session_state['supabase_auth_client']
+
+
+def login_user(email, password):
+    try:
+        res = _session_supabase().auth.sign_in_with_password({"email": email, "password": password})
+        st.session_state['user'] = res.user
+        st.rerun()
+    except Exception:
+        st.error("Invalid email or password.")
+
+
+def register_user(email, password):
+    try:
+        _session_supabase().auth.sign_up({"email": email, "password": password})
+        st.success("Registration successful! Please check your email or login.")
+    except Exception as e:
+        st.error(f"Registration failed: {e}")
+
+
+def logout_user():
+    _session_supabase().auth.sign_out()
+    st.session_state.pop('supabase_auth_client', None)
+    del st.session_state['user']
+    st.rerun()
@@ -0,0 +1,87 @@
+"""Cached client factories.
+
+Streamlit re-runs the whole script on every widget interaction, so
+module-level clients would rebuild their HTTP sessions (TLS + auth
+handshake) on each rerun. @st.cache_resource scopes them to the server
+process instead. Secrets are read inside the functions so a bad lookup
+doesn't get baked into a module-level global, and the heavy SDK imports
+(groq, supabase, sentence-transformers) stay inside the factories so the
+login page never pays for them.
+"""
+
+import httpx
+import streamlit as st
+
+from config import get_secret
+from llm_cache import LLMCache
+
+
+@st.cache_resource
+def get_http() -> httpx.Client:
+    # One HTTP/2 connection pool shared across reruns (Groq rides on this
+    # too). Keep-alive means the second and later calls to the same host
+    # skip the ~150-300ms TCP+TLS setup entirely; httpx negotiates gzip
+    # and handles decompression on its own.
+    return httpx.Client(http2=True, timeout=30.0,
+                        limits=httpx.Limits(max_keepalive_connections=8))
+
+
+@st.cache_resource
+def get_groq():
+    from groq import Groq
+    return Groq(api_key=get_secret("GROQ_API_KEY"), http_client=get_http())
+
+
+def new_supabase():
+    """Uncached constructor — see get_supabase() for the shared instance.
+
+    Auth flows must NOT run through the cached singleton: supabase-py
+    propagates the signed-in session into the client's PostgREST/storage
+    headers, so sign_in/sign_out on a process-wide client would let
+    concurrent users overwrite each other's tokens and run queries under
+    whichever user logged in last. claimshield.auth keeps one of these
+    per Streamlit session instead.
+    """
+    # ClientOptions is the SyncClientOptions alias; the base options class
+    # in supabase.lib.client_options has no httpx_client field.
+    from supabase import ClientOptions, create_client
+    # Cap PostgREST/GoTrue traffic to one persistent, bounded pool so many
+    # concurrent Streamlit sessions can't pile sockets up against Supabase
+    # (projects default to a ~60-connection ceiling). If a direct-Postgres
+    # path (asyncpg/SQLAlchemy) is ever added, point it at the
+    # transaction-mode pooler instead: port 6543 with
+    # ?pgbouncer=true&connection_limit=1 and statement_cache_size=0.
+    pool = httpx.Client(http2=True, timeout=30.0,
+                        limits=httpx.Limits(max_connections=20,
+                                            max_keepalive_connections=10))
+    return create_client(get_secret("SUPABASE_URL"),
+                         get_secret("SUPABASE_KEY"),
+                         options=ClientOptions(httpx_client=pool))
+
+
+@st.cache_resource
+def get_supabase():
+    # Shared instance for data access only; no user session is ever
+    # attached to it.
+    return new_supabase()
+
+
+@st.cache_resource
+def get_embedder():
+    # ~90MB model, loaded once per server process.
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+    return lambda text: model.encode(text).tolist()
+
+
+@st.cache_resource
+def get_llm_cache() -> LLMCache:
+    return LLMCache(get_supabase(), get_embedder())
+
+
+@st.cache_resource
+def get_executor():
+    # Shared pool for fire-and-forget work (e.g. claim inserts) whose
+    # results the rendering path doesn't wait on.
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=4)
@@ -0,0 +1,121 @@
+"""Claims table access: cached history reads and the save path."""
+
+from datetime import datetime, timezone
+
+import streamlit as st
+
+from claimshield.clients import get_executor, get_supabase
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_claims(user_id, cursor, page_size=50):
+    """One keyset page of claim history, memoized for 60s.
+
+    Every unrelated widget interaction reruns the script, and each rerun
+    was a fresh PostgREST round-trip. The TTL cache collapses those into
+    one query per minute; user_id is part of the cache key (None = admin
+    all-users view) so users never see each other's cached rows.
+    """
+    q = (get_supabase().table("claims")
+         .select("created_at,insurance_company,bill_amount,status")
+         .order("created_at", desc=True)
+         .limit(page_size))
+    if user_id:
+        q = q.eq("user_id", user_id)
+    if cursor:
+        q = q.lt("created_at", cursor)
+    return q.execute().data
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_claims_total(user_id):
+    # The aggregates drift slowly, so they tolerate a longer TTL.
+    return float(get_supabase().rpc("claims_total", {"uid": user_id}).execute().data or 0)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_claims_leaderboard(user_id):
+    return get_supabase().rpc("claims_leaderboard", {"uid": user_id}).execute().data or []
+
+
+def encode_letter(letter: str):
+    """Compress an appeal letter for storage.
+
+    Letters are repetitive legal English, which zstd shrinks 3-5x — less
+    row storage and less to haul over TLS for any read that still touches
+    the column. Returns (encoded_text, encoding_tag); the tag goes in the
+    letter_encoding column (migrations/0005) so legacy plain rows keep
+    reading back fine.
+    """
+    import base64
+    import zstandard
+    compressed = zstandard.ZstdCompressor(level=7).compress(letter.encode())
+    return base64.b64encode(compressed).decode(), 'zstd-b64'
+
+
+def decode_letter(row: dict) -> str:
+    """Inverse of encode_letter for any read path that pulls the column."""
+    import base64
+    import zstandard
+    if row.get('letter_encoding') == 'zstd-b64':
+        compressed = base64.b64decode(row['appeal_letter'])
+        return zstandard.ZstdDecompressor().decompress(compressed).decode()
+    return row['appeal_letter']
+
+
+def save_claim(user_id, company, amount, letter):
+    """Queue the claim insert on a background thread.
+
+    The insert result isn't used by the rendering path, so there is no
+    reason to stall the submit handler for the 100-400ms PostgREST
+    round-trip. Failures are surfaced on a later rerun by
+    report_save_errors().
+    """
+    encoded, encoding = encode_letter(letter)
+    data = {
+        "user_id": user_id,
+        "insurance_company": company,
+        "bill_amount": amount,
+        "appeal_letter": encoded,
+        "letter_encoding": encoding
+    }
+    future = get_executor().submit(
+        lambda: get_supabase().table("claims").insert(data).execute())
+    st.session_state.setdefault('pending_saves', []).append(future)
+
+    # Optimistic UI: prepend the new row to the paged history instead of
+    # blowing the page cache away and re-querying before the insert has
+    # even landed. report_save_errors() re-seeds the history from the
+    # server once the insert future settles, replacing this placeholder
+    # with the real row (or dropping it if the insert failed).
+    if 'history_rows' in st.session_state:
+        st.session_state['history_rows'].insert(0, {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "insurance_company": company,
+            "bill_amount": amount,
+            "status": "pending"
+        })
+
+
+def report_save_errors():
+    """Settle background claim saves; call once per rerun.
+
+    Surfaces failures, and once any insert future completes forces the
+    history to re-seed from the server — that swaps the optimistic
+    'pending' placeholder for the real row, or removes it if the insert
+    failed.
+    """
+    pending = st.session_state.get('pending_saves', [])
+    done = [f for f in pending if f.done()]
+    failed = [f for f in done if f.exception()]
+    if failed:
+        st.error(f"{len(failed)} claim save(s) failed — please save again.")
+    if done:
+        # Invalidate only now that the insert has actually landed: clearing
+        # at submit time just re-cached the aggregates without the new row,
+        # since the same rerun recomputed them before PostgREST finished.
+        load_claims.clear()
+        load_claims_total.clear()
+        load_claims_leaderboard.clear()
+        st.session_state.pop('history_rows', None)
+    st.session_state['pending_saves'] = [f for f in pending if not f.done()]
@@ -0,0 +1,121 @@
+"""Document OCR: compression, content-hash caching and concurrent fetch."""
+
+import hashlib
+
+import streamlit as st
+
+from config import get_secret
+from claimshield.clients import get_executor, get_http, get_supabase
+
+# Separator between OCR'd pages in the single user message sent to Groq.
+PAGE_BREAK = "\n\n--- PAGE BREAK ---\n\n"
+
+
+def warm_groq():
+    """Open the Groq connection in the background while OCR runs.
+
+    The ping goes through the same shared get_http() client the Groq SDK
+    is wired to, so by the time OCR text comes back the completion call
+    starts on an already-open socket instead of paying ~200-500ms of
+    TLS/HTTP2 setup. Failures don't matter — the real call handshakes
+    itself if the ping lost.
+    """
+    def ping():
+        try:
+            get_http().get('https://api.groq.com/openai/v1/models',
+                           headers={'Authorization': f"Bearer {get_secret('GROQ_API_KEY')}"})
+        except Exception:
+            pass
+    get_executor().submit(ping)
+
+
+def fetch_ocr_pages(uploads, payload):
+    """POST a batch of pages to ocr.space concurrently.
+
+    The per-page POSTs (~2-5s each) are independent, so they fan out on
+    the shared executor — its worker count caps in-flight requests so a
+    fat multi-page upload can't stampede the API. Each POST rides the
+    keep-alive client from get_http(), so repeat analyses in a session
+    reuse a warm socket to ocr.space instead of re-handshaking every
+    click. `uploads` is a list of (filename, bytes) pairs.
+    """
+    def post(upload):
+        name, data = upload
+        r = get_http().post('https://api.ocr.space/parse/image',
+                            files={'file': (name, data)}, data=payload,
+                            timeout=60.0)
+        return r.json()
+
+    return list(get_executor().map(post, uploads))
+
+
+def compress_for_ocr(file_bytes):
+    """Downscale and re-encode the upload before it goes to ocr.space.
+
+    Phone-camera bills are routinely 3-8MB at 4000x3000px; OCR engines need
+    nothing beyond ~2000px on the long edge. LANCZOS thumbnail + quality-85
+    JPEG cuts the payload 5-20x with no accuracy loss, which is most of the
+    OCR wall-clock on a cellular upload.
+    """
+    import io
+    from PIL import Image
+    try:
+        img = Image.open(io.BytesIO(file_bytes))
+        if max(img.size) <= 2000 and img.format == 'JPEG':
+            return file_bytes, False
+        img.thumbnail((2000, 2000), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.convert('RGB').save(buf, 'JPEG', quality=85, optimize=True)
+        out = buf.getvalue()
+        print(f"compress_for_ocr: {len(file_bytes)} -> {len(out)} bytes")
+        return out, True
+    except Exception:
+        # Not a decodable image (e.g. a PDF); let ocr.space handle it as-is.
+        return file_bytes, False
+
+
+def ocr_documents(uploads, payload):
+    """OCR a batch of uploads into one PAGE_BREAK-joined text.
+
+    Users re-upload the same scans constantly (refreshes, tab hops, letter
+    tweaks), and each ocr.space call costs 2-5s plus API quota. Every
+    upload is keyed by a hash of its bytes and served from the in-session
+    tier, then the Supabase ocr_cache table (migrations/0002), before any
+    network call; only the misses are POSTed, concurrently. `uploads` is a
+    list of (filename, bytes) pairs.
+    """
+    warm_groq()  # the Groq call that follows rides this connection
+    mem = st.session_state.setdefault('ocr_cache', {})
+    keys = [hashlib.blake2b(d, digest_size=16).hexdigest() for _, d in uploads]
+    misses = []
+    for key, (name, data) in zip(keys, uploads):
+        if key in mem:
+            continue
+        try:
+            hit = (get_supabase().table('ocr_cache').select('text')
+                   .eq('hash', key).maybe_single().execute())
+            if hit and hit.data:
+                mem[key] = hit.data['text']
+                continue
+        except Exception:
+            pass
+        # Compression happens only on cache misses, so re-uploads of the
+        # same bytes never pay for Pillow either.
+        data, recoded = compress_for_ocr(data)
+        misses.append((key, ('page.jpg' if recoded else name, data)))
+
+    if misses:
+        results = fetch_ocr_pages([u for _, u in misses], payload)
+        for (key, _), res in zip(misses, results):
+            parsed = res.get('ParsedResults') or []
+            text = PAGE_BREAK.join(p.get('ParsedText', '') for p in parsed).strip()
+            if not text:
+                continue
+            mem[key] = text
+            try:
+                get_supabase().table('ocr_cache').upsert({'hash': key, 'text': text}).execute()
+            except Exception:
+                pass  # cache write failures must not break the analyze flow
+
+    texts = [mem[k] for k in keys if k in mem]
+    return PAGE_BREAK.join(texts) if texts else None
@@ -0,0 +1,21 @@
+"""PDF rendering for the downloadable appeal letter."""
+
+import streamlit as st
+
+
+@st.cache_data(show_spinner=False)
+def generate_pdf(text: str) -> bytes:
+    # Memoized: the download button re-renders on every rerun and this
+    # pure-Python text-wrapping loop costs ~30-100ms per letter.
+    # Core-font (Helvetica) metrics are module-level dicts in fpdf2 >= 2.7,
+    # not per-instance AFM file reads as in legacy PyFPDF, so constructing
+    # FPDF here does no font I/O.
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, "FORMAL MEDICAL APPEAL", ln=True, align="C")
+    pdf.ln(10)
+    pdf.set_font("Helvetica", size=11)
+    pdf.multi_cell(0, 8, text)
+    return bytes(pdf.output())
@@ -0,0 +1,16 @@
+"""Secrets and configuration lookups.
+
+Streamlit Cloud injects st.secrets; local runs fall back to environment
+variables so the app also works from a plain shell or .env.
+"""
+
+import os
+
+import streamlit as st
+
+
+def get_secret(name, default=""):
+    return st.secrets.get(name) or os.getenv(name, default)
+
+
+OCR_API_KEY = get_secret("OCR_API_KEY", "helloworld")
@@ -0,0 +1,58 @@
+"""Two-tier cache for Groq appeal-letter generations.
+
+Tier 1 is an exact match: the full request payload (model + messages +
+temperature) is hashed with SHA256 and looked up in the Supabase
+``llm_cache`` table. Tier 2 is a semantic fallback: the OCR text is
+embedded and matched against stored entries by cosine distance via
+pgvector, so near-duplicate bills (same provider template, same CPT
+codes) reuse an existing letter instead of paying a 10-30s LLM
+round-trip at full token cost.
+
+Expected schema and match function live in migrations/0001_llm_cache.sql.
+"""
+
+import hashlib
+import json
+
+
+class LLMCache:
+    """Write-through cache in front of chat.completions.create."""
+
+    def __init__(self, supabase, embed_fn, max_distance=0.1):
+        self.supabase = supabase
+        self.embed_fn = embed_fn  # str -> list[float], 384-dim
+        self.max_distance = max_distance
+
+    @staticmethod
+    def exact_key(model, messages, temperature):
+        payload = {"model": model, "messages": messages, "temperature": temperature}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key, prompt):
+        """Return a cached response, or None on a full miss."""
+        try:
+            hit = (self.supabase.table("llm_cache").select("response")
+                   .eq("key", key).maybe_single().execute())
+            if hit and hit.data:
+                return hit.data["response"]
+            # Semantic fallback: nearest stored prompt by cosine distance.
+            rows = self.supabase.rpc("match_llm_cache", {
+                "query_embedding": self.embed_fn(prompt),
+                "max_distance": self.max_distance,
+            }).execute().data
+            if rows:
+                return rows[0]["response"]
+        except Exception:
+            pass  # Cache misbehaving must never break generation.
+        return None
+
+    def put(self, key, prompt, response):
+        try:
+            self.supabase.table("llm_cache").upsert({
+                "key": key,
+                "prompt": prompt,
+                "embedding": self.embed_fn(prompt),
+                "response": response,
+            }).execute()
+        except Exception:
+            pass
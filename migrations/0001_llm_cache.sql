@@ -0,0 +1,25 @@
+-- Two-tier LLM response cache (see llm_cache.py).
+-- Run in the Supabase SQL editor; requires the pgvector extension.
+
+create extension if not exists vector;
+
+create table if not exists llm_cache (
+    key text primary key,
+    prompt text,
+    embedding vector(384),
+    response text,
+    created_at timestamptz default now()
+);
+
+-- Nearest cached prompt by cosine distance, gated by a max-distance
+-- threshold so unrelated bills never reuse each other's letters.
+create or replace function match_llm_cache(query_embedding vector(384), max_distance float)
+returns table (response text, distance float)
+language sql stable
+as $$
+    select response, embedding <=> query_embedding as distance
+    from llm_cache
+    where embedding <=> query_embedding < max_distance
+    order by distance
+    limit 1;
+$$;
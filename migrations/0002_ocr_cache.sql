@@ -0,0 +1,8 @@
+-- OCR result cache keyed by content hash of the uploaded image
+-- (see ocr_documents in claimshield/ocr.py). Run in the Supabase SQL editor.
+
+create table if not exists ocr_cache (
+    hash text primary key,
+    text text,
+    created_at timestamptz default now()
+);
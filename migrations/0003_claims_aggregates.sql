@@ -0,0 +1,24 @@
+-- Server-side aggregates for the History & Analytics tab, so the app
+-- never pulls every claims row (including the multi-KB appeal_letter
+-- column) just to compute scalars. A null uid means "all users" and is
+-- only passed for the admin view.
+
+create or replace function claims_total(uid uuid)
+returns numeric
+language sql stable
+as $$
+    select coalesce(sum(bill_amount), 0)
+    from claims
+    where uid is null or user_id = uid;
+$$;
+
+create or replace function claims_leaderboard(uid uuid)
+returns table (insurance_company text, n bigint, total numeric)
+language sql stable
+as $$
+    select insurance_company, count(*) as n, sum(bill_amount) as total
+    from claims
+    where uid is null or user_id = uid
+    group by 1
+    order by n desc;
+$$;
@@ -0,0 +1,13 @@
+-- Covering index for the history tab's keyset pagination: each page
+-- becomes an index-only scan on (user_id, created_at DESC) with the
+-- displayed columns included, so load time stays O(page) as claim
+-- history grows.
+--
+-- Note: CREATE INDEX CONCURRENTLY cannot run inside a transaction —
+-- run this statement on its own in the Supabase SQL editor.
+
+create index concurrently if not exists claims_user_created_idx
+    on claims (user_id, created_at desc)
+    include (insurance_company, bill_amount, status);
+
+analyze claims;
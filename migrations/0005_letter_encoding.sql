@@ -0,0 +1,6 @@
+-- Marks how claims.appeal_letter is encoded ('plain' for legacy rows,
+-- 'zstd-b64' for new writes — see encode_letter/decode_letter in
+-- claimshield/db.py).
+
+alter table claims
+    add column if not exists letter_encoding text not null default 'plain';